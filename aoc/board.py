@@ -1,4 +1,7 @@
+import sys
+from functools import lru_cache
 from typing import (
+    Any,
     Callable,
     Dict,
     Generator,
@@ -8,13 +11,22 @@ from typing import (
     Set,
     Tuple,
     TypeVar,
+    Union,
 )
 
+import numpy as np
+import numpy.typing as npt
+
 __all__ = [
+    "board_to_array",
     "print_board",
     "visualise_board",
     "find_in_board",
     "neighbours",
+    "board_grid",
+    "pack_node",
+    "unpack_node",
+    "neighbours_packed",
     "turn_right",
     "turn_left",
     "neighbours_boundary",
@@ -24,18 +36,85 @@ __all__ = [
 
 Node = Tuple[int, int]
 BoardValue = TypeVar("BoardValue")
+BoardArray = npt.NDArray[np.uint8]
 
 
-def print_board(
+def _to_byte(value: Union[str, int]) -> int:
+    """Convert a board value to the byte which represents it in a board array.
+
+    Characters are encoded as Latin-1, so decode rows of a board array with
+    `"latin-1"` to get the characters back.
+
+    Raises:
+        ValueError: If `value` cannot be represented by a single byte.
+    """
+    byte = ord(value) if isinstance(value, str) else int(value)
+    if not 0 <= byte <= 255:
+        raise ValueError(
+            f"Board value {value!r} cannot be stored in a board array: "
+            "characters must be in Latin-1."
+        )
+    return byte
+
+
+def board_to_array(
     board: Dict[Node, str],
+    fill: str = " ",
+) -> Tuple[BoardArray, Node]:
+    """Convert a board to a contiguous array of bytes.
+
+    Looking up a value in an array is much cheaper than hashing a node and probing a
+    dictionary, so use this for large boards with hot loops over the nodes.
+
+    Args:
+        board (dict[Node, str]): Board. The values must be single characters in
+            Latin-1.
+        fill (str, optional): Value for the nodes which are not in `board`. Defaults to
+            a space.
+
+    Raises:
+        ValueError: If a value of `board` or `fill` is not a character in Latin-1.
+
+    Returns:
+        tuple[np.ndarray, Node]:
+            * Board as an array of type `np.uint8`. Node `(r, c)` of `board` is at
+              position `(r - min_r, c - min_c)` of the array.
+            * The offset `(min_r, min_c)`.
+    """
+    min_r = min(r for r, _ in board.keys())
+    max_r = max(r for r, _ in board.keys())
+    min_c = min(c for _, c in board.keys())
+    max_c = max(c for _, c in board.keys())
+
+    shape = (max_r - min_r + 1, max_c - min_c + 1)
+    arr = np.full(shape, _to_byte(fill), dtype=np.uint8)
+    for (r, c), v in board.items():
+        arr[r - min_r, c - min_c] = _to_byte(v)
+    return arr, (min_r, min_c)
+
+
+def print_board(
+    board: Union[Dict[Node, str], BoardArray],
     marks: Optional[Dict[str, Iterable[Node]]] = None,
 ) -> None:
     """Print a board.
 
     Args:
-        board (dict[Node, str]): Board to visualise.
+        board (dict[Node, str] or np.ndarray): Board to visualise. Can also be a board
+            array. See :func:`board_to_array`.
         marks (dict[str, Iterable[Node]], optional): Draw markers at particular nodes.
     """
+    if isinstance(board, np.ndarray):
+        if marks:
+            # Copy the board before mutation.
+            board = board.copy()
+            for m, nodes in marks.items():
+                for n in nodes:
+                    board[n] = _to_byte(m)
+        rows = (row.tobytes().decode("latin-1") for row in board)
+        sys.stdout.write("\n".join(rows) + "\n")
+        return
+
     min_r = min(r for r, _ in board.keys())
     max_r = max(r for r, _ in board.keys())
     min_c = min(c for _, c in board.keys())
@@ -48,20 +127,21 @@ def print_board(
             for n in nodes:
                 board[n] = m
 
-    for r in range(min_r, max_r + 1):
-        for c in range(min_c, max_c + 1):
-            if (r, c) in board:
-                print(board[r, c], end="")
-            else:
-                print(" ", end="")
-        print()
+    # Build the whole picture first and write it at once. Printing every value
+    # separately is very slow for large boards.
+    get = board.get
+    cols = range(min_c, max_c + 1)
+    lines = [
+        "".join([str(get((r, c), " ")) for c in cols]) for r in range(min_r, max_r + 1)
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 visualise_board = print_board
 
 
 def find_in_board(
-    board: Dict[Node, BoardValue],
+    board: Union[Dict[Node, BoardValue], BoardArray],
     *values: BoardValue,
 ) -> Tuple[Node, ...]:
     r"""Find the node of certain board values.
@@ -69,7 +149,8 @@ def find_in_board(
     If a value occurs multiple times, any of the corresponding nodes may be returned.
 
     Args:
-        board (dict[Node, BoardValue]): Board.
+        board (dict[Node, BoardValue] or np.ndarray): Board. Can also be a board array.
+            See :func:`board_to_array`.
         \*values (BoardValue): Values to search for.
 
     Raises:
@@ -78,18 +159,87 @@ def find_in_board(
     Returns:
         tuple[Node, ...]: The nodes corresponding to `values`, in the same order.
     """
+    if isinstance(board, np.ndarray):
+        nodes = []
+        for v in values:
+            matches = np.argwhere(board == _to_byte(v))  # type: ignore[arg-type]
+            if len(matches) == 0:
+                raise AssertionError(f"Could not find `{v}` in board.")
+            nodes.append((int(matches[0, 0]), int(matches[0, 1])))
+        return tuple(nodes)
+
+    # Index the values by their first position rather than hashing them, so they need
+    # not be hashable.
     found: Dict[int, Node] = {}
+    num_distinct = sum(values.index(v) == i for i, v in enumerate(values))
     for n, v in board.items():
         if v in values:
             found[values.index(v)] = n
-    for i in range(len(values)):
-        if i not in found:
+            if len(found) == num_distinct:
+                # Everything has been found, so we can stop early.
+                break
+    for v in values:
+        if values.index(v) not in found:
             raise AssertionError(f"Could not find `{v}` in board.")
-    return tuple(found[i] for i in range(len(values)))
+    return tuple(found[values.index(v)] for v in values)
+
+
+_moves_nondiagonal: Tuple[Tuple[int, int], ...] = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_moves_diagonal: Tuple[Tuple[int, int], ...] = ((1, 1), (-1, 1), (-1, -1), (1, -1))
+_moves_all = _moves_nondiagonal + _moves_diagonal
+
+
+def _moves(nondiagonal: bool, diagonal: bool) -> Tuple[Tuple[int, int], ...]:
+    if nondiagonal and diagonal:
+        return _moves_all
+    elif nondiagonal:
+        return _moves_nondiagonal
+    elif diagonal:
+        return _moves_diagonal
+    else:
+        return ()
+
+
+def _allowed_mask(allowed: Optional[Set[Any]]) -> npt.NDArray[np.bool_]:
+    """Construct a mask over all bytes which indicates the allowed board values."""
+    allowed_mask = np.zeros(256, dtype=bool)
+    if allowed:
+        allowed_mask[[_to_byte(v) for v in allowed]] = True
+    else:
+        allowed_mask[:] = True
+    return allowed_mask
+
+
+def board_grid(
+    board: BoardArray,
+    allowed: Optional[Set[Any]] = None,
+    nondiagonal: bool = True,
+    diagonal: bool = False,
+) -> Tuple[npt.NDArray[np.bool_], npt.NDArray[np.int8]]:
+    """Describe the graph of a board array by arrays, which is the format that the
+    compiled kernels in :mod:`aoc.graph_numba` take.
+
+    Args:
+        board (np.ndarray): Board array. See :func:`board_to_array`.
+        allowed (set, optional): Board values that we're allowed to go to.
+        nondiagonal (bool, optional): Can we make non-diagonal moves? Defaults to
+            allowing non-diagonal moves.
+        diagonal (bool, optional): Can we make diagonal moves? Defaults to *not*
+            allowing diagonal moves.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            * Boolean array of the shape of `board` which indicates the nodes that
+              we're allowed to go to.
+            * Allowed moves as an array of type `np.int8` and shape `(K, 2)`.
+    """
+    passable = _allowed_mask(allowed)[board]
+    moves = np.array(_moves(nondiagonal, diagonal), dtype=np.int8).reshape(-1, 2)
+    return passable, moves
 
 
 def neighbours(
-    board: Optional[Dict[Node, BoardValue]] = None,
+    board: Optional[Union[Dict[Node, BoardValue], BoardArray]] = None,
     allowed: Optional[Set[BoardValue]] = None,
     nondiagonal: bool = True,
     diagonal: bool = False,
@@ -97,8 +247,18 @@ def neighbours(
     """Construct a function that can be given as the argument `nbs` to
     :func:`aoc.graph.shortest_path`.
 
+    For a board array, the nodes that we're allowed to go to are determined once,
+    when this function is called, and are also attached to the returned function as
+    `.grid`. Later changes to the array are not seen by the returned function, so call
+    this function again after changing the array. A dictionary board, on the other
+    hand, is read every time the returned function is called.
+
+    If `board` is not given or is empty when this function is called, all moves are
+    allowed, also after items are later added to `board`.
+
     Args:
-        board (dict[Node, BoardValue], optional): Board.
+        board (dict[Node, BoardValue] or np.ndarray, optional): Board. Can also be a
+            board array. See :func:`board_to_array`. Defaults to an unbounded board.
         allowed (set[BoardValue], optional): Board values that we're allowed to go to.
         nondiagonal (bool, optional): Can we make non-diagonal moves? Defaults to
             allowing non-diagonal moves.
@@ -110,22 +270,152 @@ def neighbours(
             The neighbour function. Takes in a node and generates tuples of neighbours
             and weights of the edges to those neighbours.
     """
-
-    moves = []
-    if nondiagonal:
-        moves.extend([(1, 0), (-1, 0), (0, 1), (0, -1)])
-    if diagonal:
-        moves.extend([(1, 1), (-1, 1), (-1, -1), (1, -1)])
+    moves = _moves(nondiagonal, diagonal)
+
+    if isinstance(board, np.ndarray):
+        num_rows, num_cols = board.shape
+        # Indexing an array element by element from Python is slow, so look up all
+        # values at once and convert the result to nested lists.
+        grid = board_grid(board, allowed, nondiagonal, diagonal)
+        passable = grid[0].tolist()
+
+        def _neighbours_array(
+            n: Node,
+        ) -> Generator[Tuple[Node, Literal[1]], None, None]:
+            r, c = n
+            for dr, dc in moves:
+                r2, c2 = r + dr, c + dc
+                if 0 <= r2 < num_rows and 0 <= c2 < num_cols and passable[r2][c2]:
+                    yield (r2, c2), 1
+
+        # Allow :func:`aoc.graph.shortest_path` to hand off to a compiled kernel.
+        _neighbours_array.grid = grid  # type: ignore[attr-defined]
+
+        return _neighbours_array
+
+    if not board:
+
+        def _neighbours_unbounded(
+            n: Node,
+        ) -> Generator[Tuple[Node, Literal[1]], None, None]:
+            r, c = n
+            for dr, dc in moves:
+                yield (r + dr, c + dc), 1
+
+        return _neighbours_unbounded
+
+    # Resolve the checks once here rather than for every move. Getting the value with
+    # a sentinel default checks membership and retrieves the value in a single probe.
+    board_get = board.get
+    allowed_values = allowed if allowed else None
+    missing = object()
 
     def _neighbours(n: Node) -> Generator[Tuple[Node, Literal[1]], None, None]:
         r, c = n
         for dr, dc in moves:
-            r2, c2 = r + dr, c + dc
-            if board and (r2, c2) not in board:
+            n2 = (r + dr, c + dc)
+            v = board_get(n2, missing)
+            if v is missing:
                 continue
-            if board and allowed and board[r2, c2] not in allowed:
+            if allowed_values is not None and v not in allowed_values:
                 continue
-            yield (r2, c2), 1
+            yield n2, 1
+
+    return _neighbours
+
+
+def pack_node(r: int, c: int) -> int:
+    """Pack a node into a single integer, which is cheaper to hash than a tuple.
+
+    Packing is linear, so a packed node can be moved by adding a packed move. Rows
+    may be negative, but then the packed node is negative. Packed nodes given to
+    :func:`aoc.graph.shortest_path_int` must be non-negative, so use only nodes with
+    `0 <= r < 2 ** 12` there.
+
+    Args:
+        r (int): Row of the node.
+        c (int): Column of the node. Must satisfy `0 <= c < 2 ** 20` for
+            :func:`unpack_node` to recover the node.
+
+    Returns:
+        int: Packed node.
+    """
+    return (r << 20) + c
+
+
+def unpack_node(k: int) -> Node:
+    """Unpack a node which was packed with :func:`pack_node`.
+
+    Args:
+        k (int): Packed node.
+
+    Returns:
+        Node: Node.
+    """
+    return k >> 20, k & 0xFFFFF
+
+
+def neighbours_packed(
+    board: Optional[Union[Dict[Node, BoardValue], BoardArray]] = None,
+    allowed: Optional[Set[BoardValue]] = None,
+    nondiagonal: bool = True,
+    diagonal: bool = False,
+) -> Callable[[int], Generator[Tuple[int, Literal[1]], None, None]]:
+    """Like :func:`neighbours`, but for nodes packed with :func:`pack_node`.
+
+    Dictionaries keyed by integers are faster than dictionaries keyed by tuples, so
+    this speeds up :func:`aoc.graph.shortest_path`. Columns must satisfy
+    `0 <= c < 2 ** 20`. To use the result with :func:`aoc.graph.shortest_path_int`,
+    rows must also satisfy `0 <= r < 2 ** 12`. See :func:`pack_node`.
+
+    Unlike :func:`neighbours` for dictionary boards, the nodes that we're allowed to
+    go to are determined once, when this function is called. Later changes to `board`
+    are not seen by the returned function, so call this function again after changing
+    the board.
+
+    Args:
+        board (dict[Node, BoardValue] or np.ndarray, optional): Board. Can also be a
+            board array. See :func:`board_to_array`.
+        allowed (set[BoardValue], optional): Board values that we're allowed to go to.
+        nondiagonal (bool, optional): Can we make non-diagonal moves? Defaults to
+            allowing non-diagonal moves.
+        diagonal (bool, optional): Can we make diagonal moves? Defaults to *not*
+            allowing diagonal moves.
+
+    Returns:
+        Callable[[int], Generator[tuple[int, Literal[1]], None, None]]:
+            The neighbour function. Takes in a packed node and generates tuples of
+            packed neighbours and weights of the edges to those neighbours.
+    """
+    deltas = tuple(pack_node(dr, dc) for dr, dc in _moves(nondiagonal, diagonal))
+
+    if board is None or len(board) == 0:
+
+        def _neighbours_unbounded(
+            k: int,
+        ) -> Generator[Tuple[int, Literal[1]], None, None]:
+            for d in deltas:
+                yield k + d, 1
+
+        return _neighbours_unbounded
+
+    # Determine all nodes that we're allowed to go to once.
+    passable: Set[int]
+    if isinstance(board, np.ndarray):
+        rs, cs = np.nonzero(_allowed_mask(allowed)[board])
+        passable = {pack_node(r, c) for r, c in zip(rs.tolist(), cs.tolist())}
+    else:
+        passable = {
+            pack_node(r, c)
+            for (r, c), v in board.items()
+            if not allowed or v in allowed
+        }
+
+    def _neighbours(k: int) -> Generator[Tuple[int, Literal[1]], None, None]:
+        for d in deltas:
+            k2 = k + d
+            if k2 in passable:
+                yield k2, 1
 
     return _neighbours
 
@@ -194,7 +484,8 @@ def neighbours_boundary(
 
     Args:
         in_region (Callable[[Node], bool], optional): A function that checks whether
-            a node is in the region of the boundary.
+            a node is in the region of the boundary. The result for every node is
+            cached, so this function must not change over time.
 
     Returns:
         Callable[[BoundaryPoint], Generator[tuple[BoundaryPoint, One], None, None]]:
@@ -202,6 +493,17 @@ def neighbours_boundary(
             generates tuples of boundary points and weights. The weights are always
             equal to one.
     """
+    if in_region:
+        # The same nodes are checked many times during a walk along the boundary, so
+        # cache the results across all calls of the neighbour function.
+        in_region = lru_cache(maxsize=None)(in_region)
+
+    def on_side(n: Node, inside: bool) -> bool:
+        """Check whether `n` is inside or outside the region, as given by `inside`."""
+        if not in_region:
+            # Just return all possibilities.
+            return True
+        return in_region(n) == inside
 
     def _neighbours(
         b: BoundaryPoint,
@@ -210,62 +512,60 @@ def neighbours_boundary(
             in1, in2 = in_region(b[0]), in_region(b[1])
             if not (in1 ^ in2):
                 raise ValueError("Given point is not in the boundary.")
-
-        def in_boundary(b2: BoundaryPoint) -> bool:
-            """Check whether `b2` is in the boundary."""
-            if not in_region:
-                # Just return all possibilities.
-                return True
-            return in_region(b2[0]) == in1 and in_region(b2[1]) == in2
+        else:
+            in1, in2 = True, False
 
         (r1, c1), (r2, c2) = b
 
-        # Extend edge in both ways.
+        # Extend edge in both ways. This moves both nodes, so both must be checked.
         dr, dc = r2 - r1, c2 - c1
         if dc == 0:
             # In the same column, so vector is vertical, meaning that we need to move
             # it left and right.
             assert abs(dr) == 1
             b2 = (r1, c1 - 1), (r2, c2 - 1)
-            if in_boundary(b2):
+            if on_side(b2[0], in1) and on_side(b2[1], in2):
                 yield b2, 1
             b2 = (r1, c1 + 1), (r2, c2 + 1)
-            if in_boundary(b2):
+            if on_side(b2[0], in1) and on_side(b2[1], in2):
                 yield b2, 1
         else:
             # In the same row, so vector is horizontal, meaning that we need to move
             # it up and down.
             assert abs(dc) == 1
             b2 = (r1 - 1, c1), (r2 - 1, c2)
-            if in_boundary(b2):
+            if on_side(b2[0], in1) and on_side(b2[1], in2):
                 yield b2, 1
             b2 = (r1 + 1, c1), (r2 + 1, c2)
-            if in_boundary(b2):
+            if on_side(b2[0], in1) and on_side(b2[1], in2):
                 yield b2, 1
 
-        # Attempt to turn around coordinate 1, so coordinate 1 stays.
+        # Attempt to turn around coordinate 1, so coordinate 1 stays. Turning right and
+        # left is inlined to avoid the function calls. See :func:`turn_right` and
+        # :func:`turn_left`. Coordinate 1 is known to be on the right side, so only
+        # the other coordinate needs to be checked.
         dr, dc = r2 - r1, c2 - c1
-        for dr2, dc2 in [turn_right(dr, dc), turn_left(dr, dc)]:
+        for dr2, dc2 in ((dc, -dr), (-dc, dr)):
             bm = (r1, c1), (r1 + (dr2 + dr), c1 + (dc2 + dc))
             b2 = (r1, c1), (r1 + dr2, c1 + dc2)
-            if in_boundary(b2):
+            if on_side(b2[1], in2):
                 # If this coordinate is not in the region, then the middle point must
                 # also be in the boundary. Otherwise, we might leave the boundary and
                 # come back. This is not an issue if this coordinate is in the region.
                 if in_region and not in1:
-                    if in_boundary(bm):
+                    if on_side(bm[1], in2):
                         yield b2, 1
                 else:
                     yield b2, 1
 
         # Attempt to turn around coordinate 2, so coordinate 2 stays.
         dr, dc = r1 - r2, c1 - c2
-        for dr2, dc2 in [turn_right(dr, dc), turn_left(dr, dc)]:
+        for dr2, dc2 in ((dc, -dr), (-dc, dr)):
             bm = (r2 + (dr2 + dr), c2 + (dc2 + dc)), (r2, c2)
             b2 = (r2 + dr2, c2 + dc2), (r2, c2)
-            if in_boundary(b2):
+            if on_side(b2[0], in1):
                 if in_region and not in2:
-                    if in_boundary(bm):
+                    if on_side(bm[0], in1):
                         yield b2, 1
                 else:
                     yield b2, 1
@@ -1,7 +1,5 @@
-from collections import defaultdict
-from typing import Callable, Dict, Generator, Iterable, Set, Tuple, TypeVar
-
-from .graph import shortest_path
+from collections import defaultdict, deque
+from typing import Callable, Dict, Iterable, List, Set, Tuple, TypeVar
 
 __all__ = ["max_flow"]
 
@@ -43,47 +41,71 @@ def max_flow(
     """
     assert source != sink, "Source and sink are the same, but must be different."
 
-    flow: Dict[Tuple[Node, Node], float] = defaultdict(int)
-
-    def bfs_nbs(n1: Node) -> Generator[Tuple[Node, float], None, None]:
-        """Neighbourhood function to perform a BFS in the residual graph."""
-        for n2, w12 in nbs(n1):
-            w12 -= flow[n1, n2]
-            assert w12 >= 0, "Flow exceeds edge capacity."
-            if w12 > 0:
-                # Return unity weight to perform a BFS.
-                yield n2, 1
-
-    # Cache edge weights for faster look-up.
-    ws: Dict[Tuple[Node, Node], float] = {
-        (n1, n2): w12 for n1 in nodes for n2, w12 in nbs(n1)
-    }
+    # Cache capacities for faster look-up. This avoids calling `nbs` during every BFS.
+    # Nested dictionaries avoid constructing a tuple key for every look-up.
+    cap: Dict[Node, Dict[Node, float]] = {}
+    for n1 in nodes:
+        cap[n1] = dict(nbs(n1))
+        if __debug__:
+            for w12 in cap[n1].values():
+                assert w12 >= 0, f"Capacity must be non-negative: {w12}."
+
+    flow: Dict[Node, Dict[Node, float]] = defaultdict(dict)
+    for n1, cap_n1 in cap.items():
+        flow[n1] = dict.fromkeys(cap_n1, 0)
+
+    def bfs() -> Tuple[Set[Node], Dict[Node, Node]]:
+        """Perform a BFS in the residual graph. Stop as soon as `sink` is found.
+
+        All edges have unit weight, so a queue suffices and no heap is needed.
+        """
+        reached: Set[Node] = {source}
+        prev: Dict[Node, Node] = {}
+        q = deque([source])
+        while q:
+            n1 = q.popleft()
+            flow_n1 = flow[n1]
+            for n2, c12 in cap[n1].items():
+                if n2 in reached:
+                    continue
+                if c12 - flow_n1[n2] > 0:
+                    reached.add(n2)
+                    prev[n2] = n1
+                    if n2 == sink:
+                        return reached, prev
+                    q.append(n2)
+        return reached, prev
 
     while True:
-        dist, prev = shortest_path(source, bfs_nbs)
-
-        if sink in dist:
-            # Found an augmenting path.
-            path, n = [sink], sink
-            while n != source:
-                n = prev[n][0]
-                path.append(n)
-            path = list(reversed(path))
-
-            # Check by how much the flow can be increased along this path.
-            c = min(ws[n1, n2] for n1, n2 in zip(path[:-1], path[1:]))
+        reached, prev = bfs()
+
+        if sink in reached:
+            # Found an augmenting path. Walk back along it once to collect its edges
+            # and to check by how much the flow can be increased along it.
+            edges: List[Tuple[Node, Node]] = []
+            c = float("inf")
+            n2 = sink
+            while n2 != source:
+                n1 = prev[n2]
+                edges.append((n1, n2))
+                c = min(c, cap[n1][n2] - flow[n1][n2])
+                n2 = n1
 
             # Increase the flow by that much.
-            for n1, n2 in zip(path[:-1], path[1:]):
-                flow[n1, n2] += c
-                flow[n2, n1] -= c
+            for n1, n2 in edges:
+                flow[n1][n2] += c
+                flow[n2][n1] = flow[n2].get(n1, 0) - c
 
         else:
             # No augmenting path possible. We're done!
-            max_flow_value = sum(flow[source, n] for n, _ in nbs(source))
-            source_connected = set(dist.keys())
+            max_flow_value = sum(flow[source].values())
+            source_connected = reached
             return (
                 max_flow_value,
-                dict(flow),
+                {
+                    (n1, n2): f12
+                    for n1, flow_n1 in flow.items()
+                    for n2, f12 in flow_n1.items()
+                },
                 (source_connected, set(nodes) - source_connected),
             )
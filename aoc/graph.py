@@ -1,6 +1,10 @@
 import heapq
+from collections import deque
+from functools import lru_cache
 from typing import (
+    Any,
     Callable,
+    Deque,
     Dict,
     Generator,
     Iterable,
@@ -10,10 +14,20 @@ from typing import (
     Set,
     Tuple,
     TypeVar,
+    Union,
 )
 
+import numpy as np
+import numpy.typing as npt
+
+from .board import BoardArray, board_grid
+
 __all__ = [
     "shortest_path",
+    "shortest_path_int",
+    "shortest_path_segtree",
+    "shortest_path_grid",
+    "to_csr",
     "backtrace",
     "reduce_edges",
     "cliques",
@@ -23,18 +37,39 @@ __all__ = [
 Node = TypeVar("Node")
 
 
+# Compiling the grid kernel takes about a second on first use, and the kernel saves a
+# few microseconds per node. Below this many passable nodes, it does not pay off.
+_GRID_KERNEL_MIN_NODES = 250_000
+
+
+def _numba_available() -> bool:
+    # Import Numba only when it might be used. Importing it is slow.
+    from .graph_numba import numba_available
+
+    return numba_available
+
+
+def _never(n: Node, d: float) -> bool:
+    return False
+
+
+def _zero(n: Node) -> float:
+    return 0
+
+
 def shortest_path(
     start: Node,
     nbs: Callable[[Node], Iterator[Tuple[Node, float]]],
-    callback: Callable[[Node, float], bool] = lambda n, d: False,
-    heuristic: Callable[[Node], float] = lambda n: 0,
+    callback: Callable[[Node, float], bool] = _never,
+    heuristic: Callable[[Node], float] = _zero,
     revisit: bool = False,
     seen: Optional[Set[Node]] = None,
+    target: Optional[Node] = None,
 ) -> Tuple[Dict[Node, float], Dict[Node, List[Node]]]:
     """Dijkstra's algorithm to compute all shortest paths starting at `start`.
 
-    All edge weights must be non-negative. You can also use this function to efficiently
-    perform a BFS::
+    All edge weights must be non-negative. For performance, this is not checked. You
+    can also use this function to efficiently perform a BFS::
 
         reachable, _ = shortest_path(start, nbs)
 
@@ -56,6 +91,10 @@ def shortest_path(
         revisit (bool, optional): Allow the algorithm to revisit the same node more
             than once. Defaults to `False`.
         seen (set[Node], optional): Consider these nodes already seen.
+        target (Node, optional): Only find the shortest paths to this node. Nodes which
+            cannot be on a shortest path to `target` are not explored and might be
+            missing from the result. The search stops as soon as `target` is settled
+            and all shortest paths to `target` are found.
 
     In this implementation of Dijkstra's algorithm, `n1` is chosen such that (a) `n1`
     is unseen and (b) `n1` has lowest `dist[n1] = d1`. By the induction hypothesis, for
@@ -90,53 +129,434 @@ def shortest_path(
     If the heuristic is not monotonic, you need to search over all possible paths by
     allowed the algorithm to revisit the same node more than once.
 
+    If `nbs` is constructed by :func:`aoc.board.neighbours` from a board array with
+    many passable nodes and Numba is installed, then, if the other arguments are left
+    to their defaults, the search is performed by a compiled kernel. See
+    :func:`aoc.graph_numba.bfs_grid`.
+
     Returns:
         tuple[dict[Node, float], dict[Node, list[Node]]]:
             * For every node, the shortest path distance to that node.
             * For every node except `start`, the previous nodes in all shortest paths to
               that node.
     """
+    grid = getattr(nbs, "grid", None)
+    if (
+        grid is not None
+        and callback is _never
+        and heuristic is _zero
+        and not revisit
+        and seen is None
+        and target is None
+        and 0 <= start[0] < grid[0].shape[0]  # type: ignore[index]
+        and 0 <= start[1] < grid[0].shape[1]  # type: ignore[index]
+        and np.count_nonzero(grid[0]) >= _GRID_KERNEL_MIN_NODES
+        and _numba_available()
+    ):
+        return _shortest_path_grid(start, *grid)  # type: ignore
+
+    if (
+        callback is _never
+        and heuristic is _zero
+        and not revisit
+        and seen is None
+        and target is None
+    ):
+        return _dijkstra_plain(start, nbs)
+
+    if heuristic is not _zero:
+        # A node can be improved upon multiple times, so cache its heuristic value.
+        heuristic = lru_cache(maxsize=None)(heuristic)
+
     dist: Dict[Node, float] = {start: 0}
     prev: Dict[Node, list[Node]] = {}
     seen = set() if seen is None else seen
 
-    q: List[Tuple[float, Node]] = [(heuristic(start), start)]
+    # Queue entries consist of the priority, the distance, and the node.
+    q: List[Tuple[float, float, Node]] = [(heuristic(start), 0, start)]
+
+    # Bind these to local names, which are faster to look up in the loop below.
+    inf = float("inf")
+    push = heapq.heappush
+    pop = heapq.heappop
+    dist_get = dist.get
+    seen_add = seen.add
+
+    # Distance to `target`, if it is given and has been found.
+    best = inf
 
     while q:
-        d1, n1 = heapq.heappop(q)
+        p1, d1, n1 = pop(q)
+
+        # All remaining nodes are further away than `target`, so we're done.
+        if p1 > best:
+            break
 
         # This needs to execute first to ensure that `d1` is right. `n1` might have
-        # been queued multiple times.
-        if n1 in seen:
+        # been queued multiple times, in which case only the entry with the shortest
+        # distance is valid.
+        if d1 > dist[n1] or n1 in seen:
             continue
 
         if callback(n1, d1):
             break
 
         if not revisit:
-            seen.add(n1)
+            seen_add(n1)
+            # Once `target` is settled, all its predecessors have been expanded, unless
+            # a predecessor with the same priority and distance could still connect
+            # via an edge of zero weight.
+            if n1 == target and not (q and q[0][0] == p1 and q[0][1] == d1):
+                break
 
         for n2, w12 in nbs(n1):
-            assert w12 >= 0, f"Weight must be non-negative: {w12}."
+            alt = d1 + w12
+            d2 = dist_get(n2, inf)
+            if alt < d2:
+                # It is the optimal path. Only now check whether `n2` was already seen:
+                # for a monotonic heuristic, seen nodes can never be improved upon.
+                if n2 in seen:
+                    continue
+                p2 = alt + heuristic(n2)
+                if p2 > best:
+                    # This cannot be on a shortest path to `target`.
+                    continue
+                dist[n2] = alt
+                prev[n2] = [n1]
+                push(q, (p2, alt, n2))
+                if n2 == target:
+                    best = alt
+            elif alt == d2 and n2 not in seen and prev[n2][-1] != n1:
+                # It is an alternative optimal path. Save the alternative. `n2` is
+                # already queued with distance `alt`, so it need not be queued again.
+                # Parallel edges would add `n1` again right after itself, which the
+                # last check prevents.
+                prev[n2].append(n1)
+
+    return dist, prev
+
+
+def _dijkstra_plain(
+    start: Node,
+    nbs: Callable[[Node], Iterator[Tuple[Node, float]]],
+) -> Tuple[Dict[Node, float], Dict[Node, List[Node]]]:
+    # Specialisation of :func:`shortest_path` for the default arguments. Without a
+    # heuristic, the priority is the distance, so queue entries are just the distance
+    # and the node.
+    dist: Dict[Node, float] = {start: 0}
+    prev: Dict[Node, List[Node]] = {}
+    seen: Set[Node] = set()
+
+    q: List[Tuple[float, Node]] = [(0, start)]
+
+    # Bind these to local names, which are faster to look up in the loop below.
+    inf = float("inf")
+    push = heapq.heappush
+    pop = heapq.heappop
+    dist_get = dist.get
+    seen_add = seen.add
 
-            if n2 in seen:
-                continue
+    while q:
+        d1, n1 = pop(q)
+
+        if d1 > dist[n1] or n1 in seen:
+            continue
+        seen_add(n1)
 
+        for n2, w12 in nbs(n1):
             alt = d1 + w12
-            d2 = dist.get(n2, float("inf"))
-            if alt <= d2:
-                if alt < d2:
-                    # It is the optimal path.
-                    dist[n2] = alt
-                    prev[n2] = [n1]
-                elif alt == d2:
-                    # It is an alternative optimal path. Save the alternative.
-                    prev[n2].append(n1)
-                heapq.heappush(q, (dist[n2] + heuristic(n2), n2))
+            d2 = dist_get(n2, inf)
+            if alt < d2:
+                # It is the optimal path. This cannot happen for seen nodes.
+                dist[n2] = alt
+                prev[n2] = [n1]
+                push(q, (alt, n2))
+            elif alt == d2 and n2 not in seen and prev[n2][-1] != n1:
+                # It is an alternative optimal path. Save the alternative, unless it
+                # is a parallel edge.
+                prev[n2].append(n1)
 
     return dist, prev
 
 
+def shortest_path_int(
+    start: int,
+    nbs: Callable[[int], Iterator[Tuple[int, int]]],
+) -> Tuple[Dict[int, int], Dict[int, List[int]]]:
+    """Like :func:`shortest_path`, but specialised to graphs where nodes are integers
+    `0 <= n < 2 ** 32` and edge weights are non-negative integers.
+
+    Every distance and node is packed into the single integer `(d << 32) | n`, so the
+    queue contains integers rather than tuples, which are much cheaper to compare.
+    For performance, only `start` is checked. Other nodes outside of the range would
+    silently be mixed up. Nodes from :func:`aoc.board.neighbours_packed` qualify if
+    all rows and columns are non-negative and there are fewer than `2 ** 12` rows.
+
+    Args:
+        start (int): Start.
+        nbs (Callable[[int], Iterator[tuple[int, int]]]): The neighbourhood function
+            of the graph. See :func:`shortest_path`.
+
+    Raises:
+        ValueError: If `start` does not satisfy `0 <= start < 2 ** 32`.
+
+    Returns:
+        tuple[dict[int, int], dict[int, list[int]]]:
+            * For every node, the shortest path distance to that node.
+            * For every node except `start`, the previous nodes in all shortest paths to
+              that node.
+    """
+    if not 0 <= start < 1 << 32:
+        raise ValueError(f"Start `{start}` must satisfy `0 <= start < 2 ** 32`.")
+
+    dist: Dict[int, int] = {start: 0}
+    prev: Dict[int, List[int]] = {}
+    seen: Set[int] = set()
+
+    q: List[int] = [start]
+
+    # Bind these to local names, which are faster to look up in the loop below.
+    inf = float("inf")
+    mask = (1 << 32) - 1
+    push = heapq.heappush
+    pop = heapq.heappop
+    dist_get = dist.get
+    seen_add = seen.add
+
+    while q:
+        x = pop(q)
+        d1, n1 = x >> 32, x & mask
+
+        if d1 > dist[n1] or n1 in seen:
+            continue
+        seen_add(n1)
+
+        for n2, w12 in nbs(n1):
+            alt = d1 + w12
+            d2 = dist_get(n2, inf)
+            if alt < d2:
+                # It is the optimal path. Without a heuristic, this cannot happen for
+                # seen nodes.
+                dist[n2] = alt
+                prev[n2] = [n1]
+                push(q, (alt << 32) | n2)
+            elif alt == d2 and n2 not in seen and prev[n2][-1] != n1:
+                # It is an alternative optimal path. Save the alternative, unless it
+                # is a parallel edge.
+                prev[n2].append(n1)
+
+    return dist, prev
+
+
+def shortest_path_segtree(
+    n: int,
+    start: int,
+    nbs: Callable[[int], Iterator[Tuple[int, float]]],
+) -> Tuple[Dict[int, float], Dict[int, List[int]]]:
+    """Like :func:`shortest_path`, but specialised to graphs where nodes are the
+    integers `0 <= node < n`.
+
+    Rather than a priority queue, this keeps the tentative distances in a segment
+    tree which supports updating a distance and finding the minimum in `O(log n)`
+    time. Every node therefore occurs at most once, so there are no outdated entries
+    to skip and memory usage does not grow with the number of edges.
+
+    Note that this is slower than :func:`shortest_path` and
+    :func:`shortest_path_int`: for 100k nodes of degree 4, this takes about three
+    times as long, and for 3k nodes of degree 300, about one and a half times as
+    long. Use this only to bound the peak memory usage of the queue.
+
+    Args:
+        n (int): Number of nodes.
+        start (int): Start.
+        nbs (Callable[[int], Iterator[tuple[int, float]]]): The neighbourhood
+            function of the graph. See :func:`shortest_path`.
+
+    Returns:
+        tuple[dict[int, float], dict[int, list[int]]]:
+            * For every node, the shortest path distance to that node.
+            * For every node except `start`, the previous nodes in all shortest paths to
+              that node.
+    """
+    inf = float("inf")
+    dist: Dict[int, float] = {start: 0}
+    prev: Dict[int, List[int]] = {}
+    seen = [False] * n
+
+    # The leaves `tree[size:size + n]` are the tentative distances of the nodes which
+    # are not yet seen. Every other entry is the minimum of its two children.
+    size = 1
+    while size < n:
+        size *= 2
+    tree = [inf] * (2 * size)
+
+    # Bind these to local names, which are faster to look up in the loop below.
+    dist_get = dist.get
+
+    def update(i: int, d: float) -> None:
+        i += size
+        tree[i] = d
+        i //= 2
+        while i:
+            tree[i] = min(tree[2 * i], tree[2 * i + 1])
+            i //= 2
+
+    update(start, 0)
+
+    while tree[1] < inf:
+        # Descend to the leaf which attains the minimum.
+        d1 = tree[1]
+        i = 1
+        while i < size:
+            i = 2 * i if tree[2 * i] == d1 else 2 * i + 1
+        n1 = i - size
+        seen[n1] = True
+        update(n1, inf)
+
+        for n2, w12 in nbs(n1):
+            alt = d1 + w12
+            d2 = dist_get(n2, inf)
+            if alt < d2:
+                # It is the optimal path. This cannot happen for seen nodes.
+                dist[n2] = alt
+                prev[n2] = [n1]
+                update(n2, alt)
+            elif alt == d2 and not seen[n2] and prev[n2][-1] != n1:
+                # It is an alternative optimal path. Save the alternative, unless it
+                # is a parallel edge.
+                prev[n2].append(n1)
+
+    return dist, prev
+
+
+def shortest_path_grid(
+    board: BoardArray,
+    start: Tuple[int, int],
+    allowed: Optional[Set[Union[str, int]]] = None,
+    nondiagonal: bool = True,
+    diagonal: bool = False,
+) -> Tuple[npt.NDArray[np.int32], npt.NDArray[np.int32]]:
+    """Compute all shortest paths on a board array starting at `start`, keeping the
+    result in arrays rather than dictionaries.
+
+    This is equivalent to :func:`shortest_path` with the neighbourhood function
+    :func:`aoc.board.neighbours`, but runs in a compiled kernel if Numba is installed.
+    The arrays take much less memory than dictionaries for large boards.
+
+    Args:
+        board (np.ndarray): Board array. See :func:`aoc.board.board_to_array`.
+        start (tuple[int, int]): Start.
+        allowed (set[str or int], optional): Board values that we're allowed to go to.
+        nondiagonal (bool, optional): Can we make non-diagonal moves? Defaults to
+            allowing non-diagonal moves.
+        diagonal (bool, optional): Can we make diagonal moves? Defaults to *not*
+            allowing diagonal moves.
+
+    Raises:
+        ValueError: If `start` is not on the board.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            * For every node, the shortest path distance to that node. Unreachable
+              nodes have distance -1.
+            * For every node, a previous node in a shortest path to that node, as an
+              array of shape `(num_rows, num_cols, 2)`. Unreachable nodes and `start`
+              have previous node `(-1, -1)`.
+    """
+    num_rows, num_cols = board.shape
+    if not (0 <= start[0] < num_rows and 0 <= start[1] < num_cols):
+        raise ValueError(f"Start `{start}` is not on the board.")
+    from .graph_numba import bfs_grid
+
+    passable, moves = board_grid(board, allowed, nondiagonal, diagonal)
+    dist, prev_index = bfs_grid(passable, moves, start[0], start[1])
+    prev = np.stack(divmod(prev_index, num_cols), axis=-1).astype(np.int32)
+    prev[prev_index < 0] = -1
+    return dist, prev
+
+
+def _shortest_path_grid(
+    start: Tuple[int, int],
+    passable: npt.NDArray[np.bool_],
+    moves: npt.NDArray[np.int8],
+) -> Tuple[Dict[Tuple[int, int], float], Dict[Tuple[int, int], List[Tuple[int, int]]]]:
+    """Run :func:`shortest_path` with the compiled kernel and convert the result."""
+    from .graph_numba import bfs_grid
+
+    dist_arr, _ = bfs_grid(passable, moves, start[0], start[1])
+    num_rows, num_cols = dist_arr.shape
+
+    rs, cs = np.nonzero(dist_arr >= 0)
+    dist: Dict[Tuple[int, int], float] = dict(
+        zip(zip(rs.tolist(), cs.tolist()), dist_arr[rs, cs].tolist())
+    )
+
+    # Find all previous nodes in shortest paths. Pad the distances to be able to look
+    # up the distance to the previous node for every move at once.
+    pad = int(np.abs(moves).max(initial=0))
+    padded = np.full((num_rows + 2 * pad, num_cols + 2 * pad), -2, dtype=np.int32)
+    padded[pad : pad + num_rows, pad : pad + num_cols] = dist_arr
+    prev: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    # Visit the previous nodes in sorted order to match the order in which the
+    # uncompiled algorithm pops them.
+    for dr, dc in sorted(moves.tolist(), key=lambda m: (-m[0], -m[1])):
+        dist_prev = padded[
+            pad - dr : pad - dr + num_rows,
+            pad - dc : pad - dc + num_cols,
+        ]
+        rs, cs = np.nonzero((dist_arr > 0) & (dist_prev == dist_arr - 1))
+        for r, c in zip(rs.tolist(), cs.tolist()):
+            if (r, c) in prev:
+                prev[r, c].append((r - dr, c - dc))
+            else:
+                prev[r, c] = [(r - dr, c - dc)]
+
+    return dist, prev
+
+
+def to_csr(
+    nodes: Iterable[Node],
+    nbs: Callable[[Node], Iterable[Tuple[Node, float]]],
+) -> Tuple[
+    List[Node],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.float64],
+]:
+    """Convert a graph to compressed sparse row (CSR) format, which can be given to
+    :func:`aoc.graph_numba.dijkstra_csr`.
+
+    Args:
+        nodes (Iterable[Node]): Nodes of the graph. Must include all neighbours.
+        nbs (Callable[[Node], Iterable[tuple[Node, float]]]): Neighbourhood function.
+            See :func:`shortest_path`.
+
+    Returns:
+        tuple[list[Node], np.ndarray, np.ndarray, np.ndarray]:
+            * The nodes. In the CSR format, nodes are represented by their index in
+              this list.
+            * Offsets of the neighbours of every node.
+            * Neighbours.
+            * Edge weights.
+    """
+    node_list = list(nodes)
+    index = {n: i for i, n in enumerate(node_list)}
+    indptr = [0]
+    indices: List[int] = []
+    weights: List[float] = []
+    for n1 in node_list:
+        for n2, w12 in nbs(n1):
+            indices.append(index[n2])
+            weights.append(w12)
+        indptr.append(len(indices))
+    return (
+        node_list,
+        np.array(indptr, dtype=np.int64),
+        np.array(indices, dtype=np.int64),
+        np.array(weights, dtype=np.float64),
+    )
+
+
 def backtrace(end: Node, prev: Dict[Node, List[Node]]) -> List[List[Node]]:
     """Backtrace a path.
 
@@ -156,19 +576,23 @@ def backtrace(end: Node, prev: Dict[Node, List[Node]]) -> List[List[Node]]:
 
     finished_paths: List[List[Node]] = []
 
-    stack: List[List[Node]] = [[end]]
-    while stack:
-        new_stack: List[List[Node]] = []
-        for path in stack:
-            if path[-1] in prev:
-                for n in prev[path[-1]]:
-                    new_stack.append(path + [n])
-            else:
-                finished_paths.append(path)
-        stack = new_stack
-
-    # Let the paths end at `end`.
-    return [list(reversed(path)) for path in finished_paths]
+    # Rather than copying partial paths, every partial path is a linked list
+    # `(n, rest)`, which starts at the earliest node and goes towards `end`. Paths are
+    # only materialised once they are finished.
+    queue: Deque[Tuple[Node, Any]] = deque([(end, None)])
+    while queue:
+        link = queue.popleft()
+        if link[0] in prev:
+            for n in prev[link[0]]:
+                queue.append((n, link))
+        else:
+            path = []
+            while link is not None:
+                path.append(link[0])
+                link = link[1]
+            finished_paths.append(path)
+
+    return finished_paths
 
 
 def reduce_edges(
@@ -192,34 +616,43 @@ def reduce_edges(
             * Reduced node set, which is guaranteed to include `irreducible`.
             * Neighbourhood function of the reduced graph.
     """
-    edges: Dict[Node, Set[Tuple[Node, float]]] = {
-        n: set(nbs(n)) for n in set(nodes) | irreducible
-    }
-
-    while True:
-        did_reduce = False
-
-        for n1 in set(edges) - irreducible:
-            if len(edges[n1]) == 2:
-                (n2, w12), (n3, w13) = edges[n1]
-                assert (n1, w12) in edges[n2], "Graph must be undirected."
-                assert (n1, w13) in edges[n3], "Graph must be undirected."
-                assert w12 >= 0, f"Weights must be non-negative: {w12}."
-                assert w13 >= 0, f"Weights must be non-negative: {w13}."
-
-                # Remove `n` and connect `nb1` and `nb2`.
-                did_reduce = True
-                edges[n2].remove((n1, w12))
-                edges[n2].add((n3, w12 + w13))
-                edges[n3].remove((n1, w13))
-                edges[n3].add((n2, w12 + w13))
-
-                del edges[n1]
-
-        if not did_reduce:
-            break
+    # Store the neighbours of every node as a dictionary mapping the neighbour to the
+    # weight. Of parallel edges, only keep the lightest one.
+    edges: Dict[Node, Dict[Node, float]] = {}
+    for n in set(nodes) | irreducible:
+        edges[n] = {}
+        for n2, w in nbs(n):
+            edges[n][n2] = min(w, edges[n].get(n2, w))
+
+    # Only nodes whose degree has changed need to be checked again.
+    worklist = deque(n for n in edges if n not in irreducible and len(edges[n]) == 2)
+
+    while worklist:
+        n1 = worklist.popleft()
+        if n1 not in edges or len(edges[n1]) != 2:
+            continue
+
+        (n2, w12), (n3, w13) = edges[n1].items()
+        assert edges[n2].get(n1) == w12, "Graph must be undirected."
+        assert edges[n3].get(n1) == w13, "Graph must be undirected."
+        assert w12 >= 0, f"Weights must be non-negative: {w12}."
+        assert w13 >= 0, f"Weights must be non-negative: {w13}."
 
-    return set(edges), lambda n: edges[n]
+        # Remove `n` and connect `nb1` and `nb2`. If `nb1` and `nb2` are already
+        # connected, keep the lightest edge.
+        w = min(w12 + w13, edges[n2].get(n3, w12 + w13))
+        del edges[n2][n1]
+        edges[n2][n3] = w
+        del edges[n3][n1]
+        edges[n3][n2] = w
+
+        del edges[n1]
+
+        for n in (n2, n3):
+            if n not in irreducible and len(edges[n]) == 2:
+                worklist.append(n)
+
+    return set(edges), lambda n: set(edges[n].items())
 
 
 def cliques(
@@ -228,8 +661,8 @@ def cliques(
 ) -> Generator[Set[Node], None, None]:
     """Find all cliques in a graph.
 
-    This is the Bron–Kerbosch algorithm. Optimisations like pivoting or more
-    optimally iterating over the candiates are possible.
+    This is the Bron–Kerbosch algorithm. When searching for maximal cliques, it
+    uses Tomita pivoting.
 
     Args:
         graph (dict[Node, set[Node]]): Graph.
@@ -265,7 +698,19 @@ def _cliques(
     else:
         yield clique
 
-    for n in list(connected_candidates):
+    if maximal and connected_candidates:
+        # Every maximal clique must include the pivot or a node not connected to the
+        # pivot, so it suffices to branch on those. Choose the pivot which leaves
+        # the fewest branches.
+        pivot = max(
+            connected_candidates | connected_excluded,
+            key=lambda u: len(connected_candidates & graph[u]),
+        )
+        branches = list(connected_candidates - graph[pivot])
+    else:
+        branches = list(connected_candidates)
+
+    for n in branches:
         # Generate all clique extension include `n`.
         yield from _cliques(
             clique | {n},
@@ -0,0 +1,209 @@
+from typing import Any, Callable, Tuple, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+__all__ = ["numba_available", "grid_neighbours", "bfs_grid", "dijkstra_csr"]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+try:
+    from numba import njit
+
+    numba_available = True
+except ImportError:  # pragma: no cover
+    numba_available = False
+
+    def njit(*args: Any, **kw_args: Any) -> Callable[[F], F]:  # type: ignore[no-redef]
+        """Fallback for :func:`numba.njit` which leaves the function as it is."""
+        return lambda f: f
+
+
+@njit(cache=True)
+def grid_neighbours(
+    passable: npt.NDArray[np.bool_],
+    moves: npt.NDArray[np.int8],
+    r: int,
+    c: int,
+    out: npt.NDArray[np.int64],
+) -> int:
+    """Find the neighbours of a node on a grid without allocating.
+
+    Args:
+        passable (np.ndarray): Boolean array which indicates the nodes that we're
+            allowed to go to.
+        moves (np.ndarray): Allowed moves as an array of shape `(K, 2)`.
+        r (int): Row of the node.
+        c (int): Column of the node.
+        out (np.ndarray): Buffer of shape `(K, 2)` to write the neighbours to.
+
+    Returns:
+        int: Number of neighbours `n`. The neighbours are `out[:n]`.
+    """
+    num_rows, num_cols = passable.shape
+    n = 0
+    for k in range(moves.shape[0]):
+        r2, c2 = r + moves[k, 0], c + moves[k, 1]
+        # LLVM folds each double-sided bounds check into one unsigned comparison.
+        if 0 <= r2 < num_rows and 0 <= c2 < num_cols and passable[r2, c2]:
+            out[n, 0] = r2
+            out[n, 1] = c2
+            n += 1
+    return n
+
+
+@njit(cache=True)
+def bfs_grid(
+    passable: npt.NDArray[np.bool_],
+    moves: npt.NDArray[np.int8],
+    sr: int,
+    sc: int,
+) -> Tuple[npt.NDArray[np.int32], npt.NDArray[np.int32]]:
+    """Compute all shortest paths on a grid starting at `(sr, sc)`.
+
+    Every move has unit weight, so Dijkstra's algorithm reduces to a BFS. The queue
+    is a flat array, because every node is queued at most once.
+
+    Args:
+        passable (np.ndarray): Boolean array which indicates the nodes that we're
+            allowed to go to.
+        moves (np.ndarray): Allowed moves as an array of shape `(K, 2)`.
+        sr (int): Row of the start. Must lie in `passable`.
+        sc (int): Column of the start. Must lie in `passable`.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            * For every node, the shortest path distance to that node. Unreachable
+              nodes have distance -1.
+            * For every node, the index `r * num_cols + c` of the previous node in a
+              shortest path. Unreachable nodes and the start have index -1.
+    """
+    num_rows, num_cols = passable.shape
+    dist = np.full((num_rows, num_cols), -1, dtype=np.int32)
+    prev = np.full((num_rows, num_cols), -1, dtype=np.int32)
+    queue = np.empty(num_rows * num_cols, dtype=np.int32)
+    nbs = np.empty((moves.shape[0], 2), dtype=np.int64)
+
+    dist[sr, sc] = 0
+    queue[0] = sr * num_cols + sc
+    head, tail = 0, 1
+
+    while head < tail:
+        i = queue[head]
+        head += 1
+        r, c = i // num_cols, i % num_cols
+        for k in range(grid_neighbours(passable, moves, r, c, nbs)):
+            r2, c2 = nbs[k, 0], nbs[k, 1]
+            if dist[r2, c2] < 0:
+                dist[r2, c2] = dist[r, c] + 1
+                prev[r2, c2] = i
+                queue[tail] = r2 * num_cols + c2
+                tail += 1
+
+    return dist, prev
+
+
+@njit(cache=True)
+def _heap_push(
+    heap_d: npt.NDArray[np.float64],
+    heap_n: npt.NDArray[np.int64],
+    size: int,
+    d: float,
+    n: int,
+) -> int:
+    """Push `(d, n)` onto a binary heap stored in two arrays and return the new size."""
+    i = size
+    while i > 0:
+        parent = (i - 1) // 2
+        if heap_d[parent] < d or (heap_d[parent] == d and heap_n[parent] <= n):
+            break
+        heap_d[i], heap_n[i] = heap_d[parent], heap_n[parent]
+        i = parent
+    heap_d[i], heap_n[i] = d, n
+    return size + 1
+
+
+@njit(cache=True)
+def _heap_pop(
+    heap_d: npt.NDArray[np.float64],
+    heap_n: npt.NDArray[np.int64],
+    size: int,
+) -> Tuple[float, int, int]:
+    """Pop the smallest `(d, n)` from a binary heap stored in two arrays. Also return
+    the new size."""
+    d_top, n_top = heap_d[0], heap_n[0]
+    size -= 1
+    d, n = heap_d[size], heap_n[size]
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and (
+            heap_d[child + 1] < heap_d[child]
+            or (
+                heap_d[child + 1] == heap_d[child] and heap_n[child + 1] < heap_n[child]
+            )
+        ):
+            child += 1
+        if d < heap_d[child] or (d == heap_d[child] and n <= heap_n[child]):
+            break
+        heap_d[i], heap_n[i] = heap_d[child], heap_n[child]
+        i = child
+    heap_d[i], heap_n[i] = d, n
+    return d_top, n_top, size
+
+
+@njit(cache=True)
+def dijkstra_csr(
+    indptr: npt.NDArray[np.int64],
+    indices: npt.NDArray[np.int64],
+    weights: npt.NDArray[np.float64],
+    start: int,
+) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.int64]]:
+    """Dijkstra's algorithm for a graph in compressed sparse row (CSR) format.
+
+    The neighbours of node `n` are `indices[indptr[n]:indptr[n + 1]]` and the weights
+    of the edges to those neighbours are `weights[indptr[n]:indptr[n + 1]]`. All
+    weights must be non-negative. See :func:`aoc.graph.to_csr` to construct this
+    format.
+
+    Args:
+        indptr (np.ndarray): Offsets of the neighbours of every node.
+        indices (np.ndarray): Neighbours.
+        weights (np.ndarray): Edge weights.
+        start (int): Start.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            * For every node, the shortest path distance to that node. Unreachable
+              nodes have distance `inf`.
+            * For every node, a previous node in a shortest path to that node.
+              Unreachable nodes and `start` have previous node -1.
+    """
+    num_nodes = indptr.shape[0] - 1
+    dist = np.full(num_nodes, np.inf)
+    prev = np.full(num_nodes, -1, dtype=np.int64)
+    seen = np.zeros(num_nodes, dtype=np.bool_)
+
+    # Every push is due to an edge, except for the push of `start`.
+    heap_d = np.empty(indices.shape[0] + 1, dtype=np.float64)
+    heap_n = np.empty(indices.shape[0] + 1, dtype=np.int64)
+
+    dist[start] = 0
+    size = _heap_push(heap_d, heap_n, 0, 0.0, start)
+
+    while size > 0:
+        d1, n1, size = _heap_pop(heap_d, heap_n, size)
+        if seen[n1]:
+            continue
+        seen[n1] = True
+        for k in range(indptr[n1], indptr[n1 + 1]):
+            n2 = indices[k]
+            alt = d1 + weights[k]
+            if alt < dist[n2]:
+                dist[n2] = alt
+                prev[n2] = n1
+                size = _heap_push(heap_d, heap_n, size, alt, n2)
+
+    return dist, prev
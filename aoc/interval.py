@@ -1,38 +1,29 @@
-from typing import Iterable, Set, Tuple
+from typing import List, Set, Tuple
 
 __all__ = ["intervals_diff", "intervals_intersect"]
 
 Interval = Tuple[float, float]
 
 
-def _remove_empty(intervals: Iterable[Interval]) -> Set[Interval]:
-    return {(lower, upper) for lower, upper in intervals if lower < upper}
+def _hull(intervals: List[Interval]) -> Interval:
+    # Smallest interval which contains all `intervals`. `intervals` must be non-empty.
+    return min(i[0] for i in intervals), max(i[1] for i in intervals)
 
 
-def _interval_diff(i1: Interval, i2: Interval) -> Set[Interval]:
-    # If there is no intersection, one must be left of the other.
-    if i1[1] <= i2[0] or i2[1] <= i1[0]:
-        return _remove_empty({i1})
-
-    if i1[0] <= i2[0] and i2[1] <= i1[1]:
-        # `i2` is contained in `i1`.
-        return _remove_empty({(i1[0], i2[0]), (i2[1], i1[1])})
-
-    if i2[0] <= i1[0] and i1[1] <= i2[1]:
-        # `i1` is contained in `i2`.
-        return set()
-
-    # The result now must be the simple intersection. There are two cases to consider.
-    if i1[0] <= i2[0]:
-        return _remove_empty({(i1[0], i2[0])})
-    else:
-        return _remove_empty({(i2[1], i1[1])})
+def _overlapping(intervals: List[Interval], i2: Interval) -> List[Interval]:
+    # All `intervals` which overlap with `i2`.
+    return [i1 for i1 in intervals if i2[0] < i1[1] and i1[0] < i2[1]]
 
 
 def intervals_diff(ints1: Set[Interval], ints2: Set[Interval]) -> Set[Interval]:
     """For two sets of disjoint open-closed intervals on the real line `ints1` and
     `ints2`, compute the set difference `ints1 - ints2`.
 
+    Both sets are sorted, after which the intervals of `ints2` are swept along with
+    those of `ints1`. This takes `O((n + m) log(n + m))` time. If one set is much
+    smaller than the other, then only intervals of the larger set which lie in the
+    range of the smaller set are sorted.
+
     Args:
         ints1 (set[:obj:`.Interval`]): First set of intervals.
         ints2 (set[:obj:`.Interval`]): Second set of intervals.
@@ -40,21 +31,64 @@ def intervals_diff(ints1: Set[Interval], ints2: Set[Interval]) -> Set[Interval]:
     Returns:
         set[:obj:`.Interval`]: `ints1 - ints2`.
     """
-    return set().union(*(_interval_diff(i1, i2) for i1 in ints1 for i2 in ints2))
-
-
-def _interval_intersect(i1: Interval, i2: Interval) -> Set[Interval]:
-    # If there is no intersection, one must be left of the other.
-    if i1[1] <= i2[0] or i2[1] <= i1[0]:
-        return set()
-
-    return _remove_empty({(max(i1[0], i2[0]), min(i1[1], i2[1]))})
+    ints1_list = [i for i in ints1 if i[0] < i[1]]
+    ints2_list = [i for i in ints2 if i[0] < i[1]]
+    result: List[Interval] = []
+
+    if ints2_list and len(ints2_list) * 10 < len(ints1_list):
+        # `ints2` is much smaller. Intervals of `ints1` outside of the hull of `ints2`
+        # are unaffected, so take them out before sorting.
+        lower2, upper2 = _hull(ints2_list)
+        affected = []
+        for i in ints1_list:
+            if i[1] <= lower2 or upper2 <= i[0]:
+                result.append(i)
+            else:
+                affected.append(i)
+        ints1_list = affected
+    elif ints1_list and len(ints1_list) * 10 < len(ints2_list):
+        # `ints1` is much smaller. Only intervals of `ints2` which overlap with the
+        # hull of `ints1` matter, so take out the others before sorting.
+        ints2_list = _overlapping(ints2_list, _hull(ints1_list))
+
+    ints2_sorted = sorted(ints2_list)
+
+    # Bind these to local names, which are faster to look up in the loop below.
+    num2 = len(ints2_sorted)
+    append = result.append
+
+    j = 0
+    for lower, upper in sorted(ints1_list):
+        # Skip the intervals of `ints2` which lie entirely to the left. Since the
+        # intervals of `ints1` are disjoint, these can be skipped for good.
+        while j < num2 and ints2_sorted[j][1] <= lower:
+            j += 1
+        # Cut out all intervals of `ints2` which overlap.
+        current = lower
+        k = j
+        while k < num2:
+            lower2, upper2 = ints2_sorted[k]
+            if lower2 >= upper:
+                break
+            if current < lower2:
+                append((current, lower2))
+            if current < upper2:
+                current = upper2
+            k += 1
+        if current < upper:
+            append((current, upper))
+    return set(result)
 
 
 def intervals_intersect(ints1: Set[Interval], ints2: Set[Interval]) -> Set[Interval]:
     """For two sets of disjoint open-closed intervals on the real line `ints1` and
     `ints2`, compute the intersection `ints1 & ints2`.
 
+    Both sets are sorted, after which they are swept along with two pointers. This
+    takes `O((n + m) log(n + m))` time. If one set is much smaller than the other, then
+    only intervals of the larger set which lie in the range of the smaller set are
+    sorted.
+
     Args:
         ints1 (set[:obj:`.Interval`]): First set of intervals.
         ints2 (set[:obj:`.Interval`]): Second set of intervals.
@@ -62,4 +96,36 @@ def intervals_intersect(ints1: Set[Interval], ints2: Set[Interval]) -> Set[Inter
     Returns:
         set[:obj:`.Interval`]: `ints1 & ints2`.
     """
-    return set().union(*(_interval_intersect(i1, i2) for i1 in ints1 for i2 in ints2))
+    ints1_list = [i for i in ints1 if i[0] < i[1]]
+    ints2_list = [i for i in ints2 if i[0] < i[1]]
+
+    # If one set is much smaller, then only intervals of the other set which overlap
+    # with the hull of the smaller set matter. Take out the others before sorting.
+    if ints1_list and len(ints1_list) * 10 < len(ints2_list):
+        ints2_list = _overlapping(ints2_list, _hull(ints1_list))
+    elif ints2_list and len(ints2_list) * 10 < len(ints1_list):
+        ints1_list = _overlapping(ints1_list, _hull(ints2_list))
+
+    ints1_sorted = sorted(ints1_list)
+    ints2_sorted = sorted(ints2_list)
+    result: List[Interval] = []
+
+    # Bind these to local names, which are faster to look up in the loop below.
+    num1, num2 = len(ints1_sorted), len(ints2_sorted)
+    append = result.append
+
+    i, j = 0, 0
+    while i < num1 and j < num2:
+        lower1, upper1 = ints1_sorted[i]
+        lower2, upper2 = ints2_sorted[j]
+        lower = lower1 if lower1 > lower2 else lower2
+        # Advance the interval which ends first. It cannot overlap anything further.
+        if upper1 < upper2:
+            if lower < upper1:
+                append((lower, upper1))
+            i += 1
+        else:
+            if lower < upper2:
+                append((lower, upper2))
+            j += 1
+    return set(result)
@@ -1,13 +1,25 @@
 import re
 from typing import Dict, List, Tuple
 
+import numpy as np
+
+from .board import BoardArray
+
 __all__ = [
     "read_lines",
     "read_board",
     "parse_board",
+    "parse_board_array",
     "parse_nums",
 ]
 
+# Only ASCII digits: `\d` also matches digits of other scripts, like "５".
+_NUM_RE = re.compile(r"-?[0-9]+")
+# Maps all ASCII characters except digits and the minus sign to a space.
+_NUM_TABLE = str.maketrans(
+    {chr(i): " " for i in range(128) if chr(i) not in "-0123456789"}
+)
+
 
 def read_lines(file_name: str) -> List[str]:
     """Read all lines form a file, properly dealing with newline characters and
@@ -21,8 +33,17 @@ def read_lines(file_name: str) -> List[str]:
             All lines in `file_name` without any empty lines at the beginning,
             empty lines at the end, or newline characters.
     """
+    # Iterate over the file rather than reading it whole, which avoids holding the
+    # full contents in memory next to the lines.
     with open(file_name, "r") as f:
-        return [line.strip() for line in f.read().strip().splitlines()]
+        lines = [line.strip() for line in f]
+    # Remove empty lines at the beginning and at the end.
+    start, end = 0, len(lines)
+    while start < end and not lines[start]:
+        start += 1
+    while end > start and not lines[end - 1]:
+        end -= 1
+    return lines[start:end]
 
 
 def parse_board(lines: List[str]) -> Tuple[int, int, Dict[Tuple[int, int], str]]:
@@ -37,22 +58,56 @@ def parse_board(lines: List[str]) -> Tuple[int, int, Dict[Tuple[int, int], str]]
             * Number of columns.
             * The board. A dictionary mapping the position to the value of the board.
     """
-    num_rows = len(lines)
-    num_cols = len(lines[0])
-    return (
-        num_rows,
-        num_cols,
-        {(r, c): lines[r][c] for r in range(num_rows) for c in range(num_cols)},
-    )
+    board = {(r, c): x for r, line in enumerate(lines) for c, x in enumerate(line)}
+    return len(lines), len(lines[0]), board
 
 
 read_board = parse_board
 
 
+def parse_board_array(lines: List[str]) -> Tuple[int, int, BoardArray]:
+    """Parse a board into a contiguous array of bytes rather than a dictionary.
+
+    This takes much less memory than :func:`parse_board` and is the board format that
+    :func:`aoc.board.neighbours` and :func:`aoc.graph.shortest_path_grid` can
+    accelerate. Use :func:`aoc.board.find_in_board` to locate characters.
+
+    Args:
+        lines (list[str]): Lines to parse the board from. All lines must have the same
+            length and consist of characters in Latin-1, which is how
+            :func:`aoc.board.board_to_array` stores characters too.
+
+    Raises:
+        ValueError: If not all lines have the same length.
+        ValueError: If a line contains a character outside of Latin-1.
+
+    Returns:
+        tuple[int, int, np.ndarray]:
+            * Number of rows.
+            * Number of columns.
+            * The board as an array of type `np.uint8`.
+    """
+    num_rows = len(lines)
+    num_cols = len(lines[0])
+    if any(len(line) != num_cols for line in lines):
+        raise ValueError("All lines of the board must have the same length.")
+    try:
+        # Use a `bytearray` to get a writable array without a copy.
+        data = bytearray("".join(lines), "latin-1")
+    except UnicodeEncodeError as e:
+        raise ValueError(
+            f"Board value {e.object[e.start]!r} cannot be stored in a board array: "
+            "characters must be in Latin-1."
+        ) from e
+    board = np.frombuffer(data, dtype=np.uint8).reshape(num_rows, num_cols)
+    return num_rows, num_cols, board
+
+
 def parse_nums(lines: List[str]) -> List[List[List[int]]]:
     """Parse sequences of numbers from lines, creating lists of integers.
 
-    For every newline, group the parsed sequences into a new group.
+    For every newline, group the parsed sequences into a new group. A number is a
+    sequence of the ASCII digits `0-9`, optionally preceded by a minus sign.
 
     Args:
         lines (list[str]): Lines to parse the numbers from.
@@ -60,12 +115,24 @@ def parse_nums(lines: List[str]) -> List[List[List[int]]]:
     Returns:
         list[list[list[int]]]: Groups of integer sequences.
     """
-    lines = list(lines)
     blocks: List[List[List[int]]] = [[]]
-    while lines:
-        line = lines.pop(0)
+    for line in lines:
         if not line:
             blocks.append([])
             continue
-        blocks[-1].append([int(x) for x in re.split(r"[^\-0-9]+", line) if x])
+        blocks[-1].append(_parse_nums_line(line))
     return blocks
+
+
+def _parse_nums_line(line: str) -> List[int]:
+    """Parse all numbers from a single line. See :func:`parse_nums`."""
+    # `_NUM_TABLE` leaves characters outside of ASCII alone, and `int` accepts digits
+    # of other scripts, so only lines in ASCII can take the fast path.
+    if line.isascii():
+        try:
+            # Fast path: blank out everything but digits and minus signs, and split.
+            return list(map(int, line.translate(_NUM_TABLE).split()))
+        except ValueError:
+            # A token like `4-5` or `--` isn't a single number, so scan properly.
+            pass
+    return [int(x) for x in _NUM_RE.findall(line)]
@@ -7,6 +7,9 @@ __all__ = [
 
 T = TypeVar("T")
 
+# Unique object to detect the end of an iterator without catching `StopIteration`.
+_sentinel = object()
+
 
 def first(xs: Iterable[T]) -> T:
     """Get the first element of an iterable.
@@ -34,9 +37,6 @@ def only(xs: Iterable[T]) -> T:
     """
     it = iter(xs)
     x = next(it)
-    try:
-        next(it)
+    if next(it, _sentinel) is not _sentinel:
         raise AssertionError("Iterable contains more than one element.")
-    except StopIteration:
-        pass  # This is what we want!
     return x
@@ -1,5 +1,8 @@
 from typing import Callable, Dict, Tuple
 
+import numpy as np
+import pytest
+
 import aoc
 
 turn_right: Dict[Tuple[int, int], Tuple[int, int]] = {
@@ -84,3 +87,56 @@ def test_neighbours_boundary(write_file: Callable[[str, str], str]) -> None:
     aoc.print_board(board)
 
     assert board == target_board
+
+
+def test_find_in_board() -> None:
+    board = {(0, 0): "S", (0, 1): ".", (1, 0): "E", (1, 1): "."}
+    assert aoc.find_in_board(board, "E", "S", "E") == ((1, 0), (0, 0), (1, 0))
+    with pytest.raises(AssertionError, match="Could not find `X`"):
+        aoc.find_in_board(board, "S", "X")
+
+    # Values need not be hashable.
+    unhashable = {(0, 0): ["S"], (0, 1): ["."], (1, 0): ["E"]}
+    assert aoc.find_in_board(unhashable, ["E"], ["S"]) == ((1, 0), (0, 0))
+
+
+def test_print_board(capsys) -> None:
+    board = {(1, 2): "S", (1, 3): ".", (2, 3): "E"}
+    aoc.print_board(board, marks={"P": [(1, 3)]})
+    assert capsys.readouterr().out == "SP\n E\n"
+    # Marking must not mutate the board.
+    assert board[1, 3] == "."
+
+
+def test_board_to_array(capsys) -> None:
+    board = {(1, 2): "S", (1, 3): ".", (2, 3): "E"}
+    arr, offset = aoc.board_to_array(board)
+
+    assert offset == (1, 2)
+    assert arr.shape == (2, 2)
+    assert aoc.find_in_board(arr, "S", "E") == ((0, 0), (1, 1))
+
+    aoc.print_board(arr, marks={"P": [(0, 1)]})
+    assert capsys.readouterr().out == "SP\n E\n"
+    # Marking must not mutate the board.
+    assert arr[0, 1] == ord(".")
+
+
+def test_board_to_array_non_ascii(capsys) -> None:
+    arr, _ = aoc.board_to_array({(0, 0): "é", (0, 1): "#"})
+    assert aoc.find_in_board(arr, "é") == ((0, 0),)
+    aoc.print_board(arr)
+    assert capsys.readouterr().out == "é#\n"
+
+    # Characters outside of Latin-1 do not fit in a byte.
+    with pytest.raises(ValueError, match="'█'"):
+        aoc.board_to_array({(0, 0): "█"})
+
+
+def test_board_grid() -> None:
+    arr, _ = aoc.board_to_array({(0, 0): "S", (0, 1): "#", (1, 0): ".", (1, 1): "."})
+    passable, moves = aoc.board_grid(arr, allowed={"S", "."}, diagonal=True)
+    assert passable.tolist() == [[True, False], [True, True]]
+    assert moves.dtype == np.int8
+    assert moves.shape == (8, 2)
+    assert aoc.board_grid(arr, nondiagonal=False, diagonal=True)[1].shape == (4, 2)
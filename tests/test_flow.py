@@ -0,0 +1,63 @@
+from typing import Dict, List, Tuple
+
+import aoc
+
+
+def test_max_flow() -> None:
+    # Example from Cormen et al., Introduction to Algorithms, Figure 26.1.
+    capacities = {
+        ("s", "v1"): 16,
+        ("s", "v2"): 13,
+        ("v1", "v3"): 12,
+        ("v2", "v1"): 4,
+        ("v2", "v4"): 14,
+        ("v3", "v2"): 9,
+        ("v3", "t"): 20,
+        ("v4", "v3"): 7,
+        ("v4", "t"): 4,
+    }
+    # Represent the directed graph by adding reverse edges with zero capacity.
+    graph: Dict[str, List[Tuple[str, float]]] = {}
+    for (n1, n2), w12 in capacities.items():
+        graph.setdefault(n1, []).append((n2, w12))
+        graph.setdefault(n2, []).append((n1, 0))
+
+    value, flow, (part1, part2) = aoc.max_flow(
+        graph.keys(),
+        lambda n: graph[n],
+        "s",
+        "t",
+    )
+
+    assert value == 23
+    # The flow must respect the capacities.
+    for (n1, n2), f12 in flow.items():
+        assert f12 <= capacities.get((n1, n2), 0)
+    # The cut must have the same value as the flow.
+    assert "s" in part1 and "t" in part2
+    cut = sum(capacities.get((n1, n2), 0) for n1 in part1 for n2 in part2)
+    assert cut == 23
+
+
+def test_max_flow_undirected() -> None:
+    # A cycle of four nodes where every edge has capacity one.
+    graph = {
+        0: [(1, 1), (3, 1)],
+        1: [(0, 1), (2, 1)],
+        2: [(1, 1), (3, 1)],
+        3: [(2, 1), (0, 1)],
+    }
+    value, _, (part1, part2) = aoc.max_flow(graph.keys(), graph.__getitem__, 0, 2)
+    assert value == 2
+    assert part1 == {0} and part2 == {1, 2, 3}
+
+
+def test_max_flow_residual_capacity() -> None:
+    # The second augmenting path can only use the residual capacity of `(s, a)`.
+    capacities = {("s", "a"): 2, ("a", "t"): 1, ("a", "b"): 5, ("b", "t"): 5}
+    graph: Dict[str, List[Tuple[str, float]]] = {}
+    for (n1, n2), w12 in capacities.items():
+        graph.setdefault(n1, []).append((n2, w12))
+        graph.setdefault(n2, []).append((n1, 0))
+    value, _, _ = aoc.max_flow(graph.keys(), graph.__getitem__, "s", "t")
+    assert value == 2
@@ -1,6 +1,14 @@
-from typing import Callable
+import random
+import subprocess
+import sys
+from typing import Callable, Dict, List, Set, Tuple
+
+import numpy as np
+import pytest
 
 import aoc
+from aoc.graph import _shortest_path_grid
+from aoc.graph_numba import dijkstra_csr
 
 
 def test_shortest_path(write_file: Callable[[str, str], str]) -> None:
@@ -46,6 +54,207 @@ def test_shortest_path(write_file: Callable[[str, str], str]) -> None:
     ]
 
 
+def test_shortest_path_array(write_file: Callable[[str, str], str]) -> None:
+    _, _, board = aoc.read_board(
+        aoc.read_lines(
+            write_file(
+                "input.txt",
+                """
+                S.....
+                .##..#
+                .#....
+                .#.###
+                .#...E
+                """,
+            )
+        )
+    )
+    arr, _ = aoc.board_to_array(board)
+    start, end = aoc.find_in_board(arr, "S", "E")
+    dist, _ = aoc.shortest_path(start, aoc.neighbours(arr, allowed={".", "S", "E"}))
+    assert dist[end] == 11
+
+    # Diagonal moves should allow a shortcut.
+    nbs = aoc.neighbours(arr, allowed={".", "S", "E"}, diagonal=True)
+    dist, _ = aoc.shortest_path(start, nbs)
+    assert dist[end] == 8
+
+    # The compiled kernel must agree with the general algorithm. The board is too
+    # small for `shortest_path` to use the kernel, so call it directly.
+    for diagonal in [False, True]:
+        nbs = aoc.neighbours(arr, allowed={".", "S", "E"}, diagonal=diagonal)
+        res_kernel = _shortest_path_grid(start, *nbs.grid)  # type: ignore
+        res_general = aoc.shortest_path(start, nbs)
+        assert res_kernel == res_general
+
+
+def test_shortest_path_dispatch(
+    monkeypatch: pytest.MonkeyPatch,
+    write_file: Callable[[str, str], str],
+) -> None:
+    _, _, arr = aoc.parse_board_array(
+        aoc.read_lines(
+            write_file(
+                "input.txt",
+                """
+                S.....
+                .##..#
+                .#....
+                .#.###
+                .#...E
+                """,
+            )
+        )
+    )
+    start, end = aoc.find_in_board(arr, "S", "E")
+
+    # Record when `shortest_path` hands off to the kernel, and make it do so for
+    # boards of any size.
+    calls: List[Tuple[int, int]] = []
+
+    def _spy(start: Tuple[int, int], *grid: np.ndarray) -> object:
+        calls.append(start)
+        return _shortest_path_grid(start, *grid)
+
+    monkeypatch.setattr(aoc.graph, "_shortest_path_grid", _spy)
+    monkeypatch.setattr(aoc.graph, "_GRID_KERNEL_MIN_NODES", 0)
+
+    for diagonal in [False, True]:
+        nbs = aoc.neighbours(arr, allowed={".", "S", "E"}, diagonal=diagonal)
+        assert aoc.shortest_path(start, nbs) == aoc.graph._dijkstra_plain(start, nbs)
+    assert calls == [start, start]
+
+    # A start off the board cannot be handled by the kernel.
+    nbs = aoc.neighbours(arr, allowed={".", "S", "E"})
+    off_board = (-1, 0)
+    dist, prev = aoc.shortest_path(off_board, nbs)
+    assert (dist, prev) == aoc.graph._dijkstra_plain(off_board, nbs)
+    assert dist[end] == 12
+    assert calls == [start, start]
+
+
+def test_import_does_not_load_numba() -> None:
+    code = "import sys, aoc; assert 'numba' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_shortest_path_grid(write_file: Callable[[str, str], str]) -> None:
+    _, _, board = aoc.read_board(
+        aoc.read_lines(
+            write_file(
+                "input.txt",
+                """
+                S.....
+                .##..#
+                .#....
+                .#.###
+                .#...E
+                """,
+            )
+        )
+    )
+    arr, _ = aoc.board_to_array(board)
+    start, end = aoc.find_in_board(arr, "S", "E")
+    dist, prev = aoc.shortest_path_grid(arr, start, allowed={".", "S", "E"})
+
+    assert dist[end] == 11
+    assert dist[1, 1] == -1
+    assert tuple(prev[start]) == (-1, -1)
+
+    # Follow the previous nodes back to the start.
+    n, length = end, 0
+    while n != start:
+        n = (int(prev[n][0]), int(prev[n][1]))
+        length += 1
+    assert length == 11
+
+    with pytest.raises(ValueError):
+        aoc.shortest_path_grid(arr, (-1, 0))
+
+
+def test_shortest_path_packed(write_file: Callable[[str, str], str]) -> None:
+    _, _, board = aoc.read_board(
+        aoc.read_lines(
+            write_file(
+                "input.txt",
+                """
+                S.....
+                .##..#
+                .#....
+                .#.###
+                .#...E
+                """,
+            )
+        )
+    )
+    start, end = aoc.find_in_board(board, "S", "E")
+    arr, _ = aoc.board_to_array(board)
+    for b in [board, arr]:
+        nbs = aoc.neighbours_packed(b, allowed={".", "S", "E"})
+        dist, prev = aoc.shortest_path(aoc.pack_node(*start), nbs)
+        assert dist[aoc.pack_node(*end)] == 11
+        path = aoc.backtrace(aoc.pack_node(*end), prev)[0]
+        assert [aoc.unpack_node(k) for k in path][:3] == [(0, 0), (0, 1), (0, 2)]
+
+        # The specialised algorithm must agree.
+        assert aoc.shortest_path_int(aoc.pack_node(*start), nbs) == (dist, prev)
+
+    # Nodes with negative rows cannot be used with the integer specialisation.
+    with pytest.raises(ValueError):
+        aoc.shortest_path_int(aoc.pack_node(-1, 0), nbs)
+
+
+def test_shortest_path_weighted() -> None:
+    graph = {
+        "a": [("b", 1), ("c", 4), ("d", 2)],
+        "b": [("c", 2), ("a", 1)],
+        "c": [("e", 0)],
+        "d": [("c", 1)],
+        "e": [("c", 0)],
+    }
+    dist, prev = aoc.shortest_path("a", lambda n: iter(graph[n]))
+    assert dist == {"a": 0, "b": 1, "c": 3, "d": 2, "e": 3}
+    assert sorted(prev["c"]) == ["b", "d"]
+    assert prev["e"] == ["c"]
+    paths = sorted(aoc.backtrace("e", prev))
+    assert paths == [["a", "b", "c", "e"], ["a", "d", "c", "e"]]
+
+    # With a target, the search should stop early.
+    dist_target, prev_target = aoc.shortest_path(
+        "a",
+        lambda n: iter(graph[n]),
+        target="c",
+    )
+    assert dist_target["c"] == 3
+    assert sorted(prev_target["c"]) == ["b", "d"]
+    # Once `c` is settled, it should not be expanded.
+    assert "e" not in dist_target
+    dist_target, _ = aoc.shortest_path("a", lambda n: iter(graph[n]), target="b")
+    assert dist_target == {"a": 0, "b": 1}
+
+    # Check the specialisation to integer nodes.
+    names = sorted(graph)
+    res = aoc.shortest_path_int(
+        0,
+        lambda i: iter([(names.index(n), w) for n, w in graph[names[i]]]),
+    )
+    assert res[0] == {names.index(n): d for n, d in dist.items()}
+    assert sorted(res[1][names.index("c")]) == [names.index("b"), names.index("d")]
+
+    res = aoc.shortest_path_segtree(
+        len(names),
+        0,
+        lambda i: iter([(names.index(n), w) for n, w in graph[names[i]]]),
+    )
+    assert res[0] == {names.index(n): d for n, d in dist.items()}
+    assert sorted(res[1][names.index("c")]) == [names.index("b"), names.index("d")]
+
+    # A monotonic heuristic must not change the distances.
+    h = {"a": 3, "b": 2, "c": 0, "d": 1, "e": 0}
+    res = aoc.shortest_path("a", lambda n: iter(graph[n]), heuristic=h.__getitem__)
+    assert res[0] == dist
+
+
 def test_reduce_edges(write_file: Callable[[str, str], str]) -> None:
     _, _, board = aoc.read_board(
         aoc.read_lines(
@@ -71,3 +280,90 @@ def test_reduce_edges(write_file: Callable[[str, str], str]) -> None:
     assert len(list(nbs(start))) == 2
     # Check distance.
     assert dist[end] == 11
+
+
+def test_dijkstra_csr() -> None:
+    rng = random.Random(0)
+    graph: Dict[int, List[Tuple[int, float]]] = {
+        n1: [(rng.randrange(50), rng.randrange(10)) for _ in range(3)]
+        for n1 in range(50)
+    }
+    dist, _ = aoc.shortest_path(0, lambda n: iter(graph[n]))
+
+    nodes, indptr, indices, weights = aoc.to_csr(graph.keys(), graph.__getitem__)
+    dist_csr, prev_csr = dijkstra_csr(indptr, indices, weights, nodes.index(0))
+
+    for i, n in enumerate(nodes):
+        assert dist_csr[i] == dist.get(n, np.inf)
+        if prev_csr[i] >= 0:
+            # The previous node must lie on a shortest path.
+            n_prev = nodes[prev_csr[i]]
+            assert any(
+                dist[n_prev] + w == dist[n] for n2, w in graph[n_prev] if n2 == n
+            )
+
+
+def test_reduce_edges_chain() -> None:
+    # A path 0 - 1 - ... - 9 with a detour 4 - 10 - 6.
+    graph: Dict[int, Dict[int, float]] = {n: {} for n in range(11)}
+    for n1, n2, w in [(n, n + 1, 1) for n in range(9)] + [(4, 10, 1), (10, 6, 5)]:
+        graph[n1][n2] = w
+        graph[n2][n1] = w
+    nodes, nbs = aoc.reduce_edges(graph, {0, 9}, lambda n: iter(graph[n].items()))
+    # The detour is heavier, so the parallel edges between 4 and 6 merge and the
+    # whole graph reduces to a single edge.
+    assert nodes == {0, 9}
+    assert set(nbs(0)) == {(9, 9)}
+    assert aoc.shortest_path(0, lambda n: iter(nbs(n)))[0][9] == 9
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cliques(seed: int) -> None:
+    rng = random.Random(seed)
+    graph: Dict[int, Set[int]] = {n: set() for n in range(12)}
+    for n1 in range(12):
+        for n2 in range(n1):
+            if rng.random() < 0.5:
+                graph[n1].add(n2)
+                graph[n2].add(n1)
+
+    def is_clique(nodes: Set[int]) -> bool:
+        return all(n2 in graph[n1] for n1 in nodes for n2 in nodes if n1 != n2)
+
+    all_cliques = [c for c in aoc.cliques(graph, maximal=False)]
+    assert len(all_cliques) == len({frozenset(c) for c in all_cliques})
+    assert all(is_clique(c) for c in all_cliques)
+    maximal = {frozenset(c) for c in all_cliques if not any(c < d for d in all_cliques)}
+    assert {frozenset(c) for c in aoc.cliques(graph)} == maximal
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_shortest_path_segtree(seed: int) -> None:
+    rng = random.Random(seed)
+    n = 50
+    graph = {
+        i: [(j, rng.randrange(10)) for j in range(n) if rng.random() < 0.5]
+        for i in range(n)
+    }
+    dist, prev = aoc.shortest_path(0, lambda i: iter(graph[i]))
+    dist_segtree, prev_segtree = aoc.shortest_path_segtree(
+        n, 0, lambda i: iter(graph[i])
+    )
+    assert dist_segtree == dist
+    assert {k: sorted(v) for k, v in prev_segtree.items()} == {
+        k: sorted(v) for k, v in prev.items()
+    }
+
+
+def test_shortest_path_parallel_edges() -> None:
+    graph = {0: [(1, 1), (1, 1), (2, 1)], 1: [(3, 1), (3, 1)], 2: [(3, 1)], 3: []}
+    for res in [
+        aoc.shortest_path(0, lambda n: iter(graph[n])),
+        aoc.shortest_path(0, lambda n: iter(graph[n]), callback=lambda n, d: False),
+        aoc.shortest_path_int(0, lambda n: iter(graph[n])),
+        aoc.shortest_path_segtree(4, 0, lambda n: iter(graph[n])),
+    ]:
+        dist, prev = res
+        assert prev[1] == [0]
+        assert sorted(prev[3]) == [1, 2]
+        assert len(aoc.backtrace(3, prev)) == 2
@@ -1,6 +1,8 @@
+import random
+
 import pytest
 
-from aoc.interval import _interval_diff, _interval_intersect
+import aoc
 
 
 @pytest.mark.parametrize(
@@ -17,7 +19,7 @@ from aoc.interval import _interval_diff, _interval_intersect
     ],
 )
 def test_interval_diff(i1, i2, res):
-    assert _interval_diff(i1, i2) == res
+    assert aoc.intervals_diff({i1}, {i2}) == res
 
 
 @pytest.mark.parametrize(
@@ -34,4 +36,48 @@ def test_interval_diff(i1, i2, res):
     ],
 )
 def test_interval_intersect(i1, i2, res):
-    assert _interval_intersect(i1, i2) == res
+    assert aoc.intervals_intersect({i1}, {i2}) == res
+
+
+def _brute_force(ints):
+    """Represent a set of intervals with integer endpoints by the integers it
+    contains."""
+    return {x for lower, upper in ints for x in range(lower + 1, upper + 1)}
+
+
+def test_intervals_diff_intersect():
+    ints1 = {(0, 10), (12, 20), (25, 30)}
+    ints2 = {(2, 3), (5, 6), (9, 13), (19, 26)}
+    assert aoc.intervals_diff(ints1, ints2) == {
+        (0, 2),
+        (3, 5),
+        (6, 9),
+        (13, 19),
+        (26, 30),
+    }
+    assert aoc.intervals_intersect(ints1, ints2) == {
+        (2, 3),
+        (5, 6),
+        (9, 10),
+        (12, 13),
+        (19, 20),
+        (25, 26),
+    }
+    assert aoc.intervals_diff(ints1, set()) == ints1
+    assert aoc.intervals_intersect(ints1, set()) == set()
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("n1, n2", [(6, 6), (2, 40), (40, 2)])
+def test_intervals_random(seed, n1, n2):
+    rng = random.Random(seed)
+
+    def sample(n):
+        points = sorted(rng.sample(range(200), 2 * rng.randrange(n)))
+        return set(zip(points[::2], points[1::2]))
+
+    ints1, ints2 = sample(n1), sample(n2)
+    diff = aoc.intervals_diff(ints1, ints2)
+    intersect = aoc.intervals_intersect(ints1, ints2)
+    assert _brute_force(diff) == _brute_force(ints1) - _brute_force(ints2)
+    assert _brute_force(intersect) == _brute_force(ints1) & _brute_force(ints2)
@@ -0,0 +1,62 @@
+from typing import Callable
+
+import numpy as np
+import pytest
+
+import aoc
+
+
+def test_parse_nums(write_file: Callable[[str, str], str]) -> None:
+    lines = aoc.read_lines(
+        write_file(
+            "input.txt",
+            """
+            Sensor at x=2, y=-18: closest beacon is at x=-2, y=15
+            1 2 3
+
+            4-5, 6 -- 7
+            """,
+        )
+    )
+    assert aoc.parse_nums(lines) == [[[2, -18, -2, 15], [1, 2, 3]], [[4, -5, 6, 7]]]
+
+    # Digits of other scripts are not numbers.
+    assert aoc.parse_nums(["a ５ b"]) == [[[]]]
+    assert aoc.parse_nums(["x=-５3, y=é7"]) == [[[3, 7]]]
+
+
+def test_parse_board() -> None:
+    num_rows, num_cols, board = aoc.parse_board(["#.", ".S", "E#"])
+    assert (num_rows, num_cols) == (3, 2)
+    assert board == {
+        (0, 0): "#",
+        (0, 1): ".",
+        (1, 0): ".",
+        (1, 1): "S",
+        (2, 0): "E",
+        (2, 1): "#",
+    }
+
+
+def test_parse_board_array() -> None:
+    lines = ["#.", ".S", "E#"]
+    num_rows, num_cols, board = aoc.parse_board_array(lines)
+    assert (num_rows, num_cols) == (3, 2)
+    assert board.dtype == np.uint8
+    assert board.flags.writeable
+    assert np.all(board == aoc.board_to_array(aoc.parse_board(lines)[2])[0])
+    assert aoc.find_in_board(board, "S", "E") == ((1, 1), (2, 0))
+
+    with pytest.raises(ValueError):
+        aoc.parse_board_array(["#.", "."])
+
+    _, _, board = aoc.parse_board_array(["é#"])
+    assert aoc.find_in_board(board, "é") == ((0, 0),)
+    with pytest.raises(ValueError, match="'█'"):
+        aoc.parse_board_array(["█#"])
+
+
+def test_read_lines(write_file: Callable[[str, str], str]) -> None:
+    path = write_file("input.txt", "\n  \n  a b \n\nc\r\n  \n\n")
+    assert aoc.read_lines(path) == ["a b", "", "c"]
+    assert aoc.read_lines(write_file("empty.txt", "\n\n")) == []
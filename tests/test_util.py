@@ -0,0 +1,14 @@
+import pytest
+
+import aoc
+
+
+def test_first() -> None:
+    assert aoc.first(x for x in [3, 4]) == 3
+
+
+def test_only() -> None:
+    assert aoc.only({5}) == 5
+    assert aoc.only([None]) is None
+    with pytest.raises(AssertionError):
+        aoc.only([1, 2])